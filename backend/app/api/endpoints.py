@@ -55,7 +55,7 @@ async def get_session(session_id: str, db: Session = Depends(get_db)):
 @router.post("/documents/{document_id}/extract", response_model=ExtractionResultRead)
 async def extract_document(document_id: str, db: Session = Depends(get_db)):
     try:
-        return DocumentService.extract_document_data(db, document_id)
+        return await DocumentService.extract_document_data(db, document_id)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -1,15 +1,29 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.db.session import engine, Base
 from app.api.endpoints import router as api_router
+from app.services.document_intelligence import (
+    close_document_intelligence_service,
+    open_document_intelligence_service,
+)
 
 Base.metadata.create_all(bind=engine)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await open_document_intelligence_service()
+    yield
+    await close_document_intelligence_service()
+
 app = FastAPI(
     title="Tax Processing Agent",
     description="AI-powered tax return preparation agent",
     version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS to allow access from anywhere
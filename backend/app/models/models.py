@@ -18,7 +18,7 @@ class Document(Base):
     __tablename__ = "documents"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    session_id = Column(String, ForeignKey("upload_sessions.id"))
+    session_id = Column(String, ForeignKey("upload_sessions.id"), index=True)
     filename = Column(String)
     file_path = Column(String)  # Path on disk
     file_size = Column(Integer)
@@ -61,7 +61,7 @@ class WorkflowState(Base):
     __tablename__ = "workflow_states"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    session_id = Column(String, ForeignKey("upload_sessions.id"), unique=True)
+    session_id = Column(String, ForeignKey("upload_sessions.id"), unique=True, nullable=False)
     state_data = Column(JSON)
     status = Column(String)
     updated_at = Column(DateTime, default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC))
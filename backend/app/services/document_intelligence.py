@@ -1,24 +1,61 @@
+from typing import IO, Optional, Union
+import aiohttp
 from azure.core.credentials import AzureKeyCredential
-from azure.ai.documentintelligence import DocumentIntelligenceClient
+from azure.core.pipeline.transport import AioHttpTransport
+from azure.ai.documentintelligence.aio import DocumentIntelligenceClient
 from azure.ai.documentintelligence.models import AnalyzeResult
 from app.core.config import settings
 
+CONNECTION_LIMIT = 50
+KEEPALIVE_TIMEOUT = 60
+# SDK default is 5s, which dominates latency for small single-page forms
+POLLING_INTERVAL = 1
+
 class DocumentIntelligenceService:
     def __init__(self):
+        # Must be constructed inside the running loop: the aiohttp session binds to it
+        connector = aiohttp.TCPConnector(
+            limit=CONNECTION_LIMIT,
+            limit_per_host=CONNECTION_LIMIT,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+        )
         self.client = DocumentIntelligenceClient(
             endpoint=settings.DOCUMENTINTELLIGENCE_ENDPOINT,
-            credential=AzureKeyCredential(settings.DOCUMENTINTELLIGENCE_API_KEY)
+            credential=AzureKeyCredential(settings.DOCUMENTINTELLIGENCE_API_KEY),
+            transport=AioHttpTransport(
+                session=aiohttp.ClientSession(connector=connector),
+                session_owner=True,
+            ),
         )
     
-    def analyze_tax_document(self, pdf_bytes: bytes) -> AnalyzeResult:
-        poller = self.client.begin_analyze_document("prebuilt-tax.us", pdf_bytes)
-        return poller.result()
+    async def analyze_tax_document(self, document: Union[bytes, IO[bytes]]) -> AnalyzeResult:
+        # Accepts an open binary file so the SDK streams the request body
+        # instead of requiring the whole PDF in memory.
+        poller = await self.client.begin_analyze_document(
+            "prebuilt-tax.us",
+            document,
+            polling_interval=POLLING_INTERVAL,
+        )
+        return await poller.result()
+    
+    async def close(self):
+        await self.client.close()
 
-_service_instance = None
+# Owned by the app lifespan: opened on startup, closed on shutdown, same event loop
+_service_instance: Optional[DocumentIntelligenceService] = None
 
-def get_document_intelligence_service() -> DocumentIntelligenceService:
+async def open_document_intelligence_service():
     global _service_instance
     if _service_instance is None:
         _service_instance = DocumentIntelligenceService()
+
+def get_document_intelligence_service() -> DocumentIntelligenceService:
+    if _service_instance is None:
+        raise RuntimeError("Document Intelligence service is not open; it is opened by the app lifespan")
     return _service_instance
 
+async def close_document_intelligence_service():
+    global _service_instance
+    if _service_instance is not None:
+        await _service_instance.close()
+    _service_instance = None
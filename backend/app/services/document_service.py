@@ -1,4 +1,9 @@
+import asyncio
 import os
+import uuid
+from datetime import datetime, UTC
+from typing import List
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
 from app.models.models import Document, ExtractionResult
 from app.schemas.schemas import ExtractionResultRead
@@ -6,32 +11,76 @@ from app.services.extraction import process_document
 
 class DocumentService:
     @staticmethod
-    def extract_document_data(db: Session, document_id: str) -> ExtractionResultRead:
-        db_doc = db.query(Document).filter(Document.id == document_id).first()
-        if not db_doc:
-            raise ValueError("Document not found")
-        
-        if not os.path.exists(db_doc.file_path):
-            raise ValueError("PDF file not found on disk")
-        
-        try:
-            doc_type, extracted_data, warnings = process_document(db_doc.file_path)
-            
-            extraction_result = ExtractionResult(
-                document_id=document_id,
-                document_type=doc_type,
-                structured_data=extracted_data.model_dump(),
-                warnings="; ".join(warnings) if warnings else None
-            )
-            db.add(extraction_result)
-            db_doc.status = "parsed"
-            db.commit()
-            db.refresh(extraction_result)
-            
-            return ExtractionResultRead.model_validate(extraction_result)
-        
-        except Exception as e:
-            db_doc.status = "error"
-            db.commit()
-            raise ValueError(f"Extraction failed: {str(e)}")
+    async def extract_document_data(db: Session, document_id: str) -> ExtractionResultRead:
+        return (await DocumentService.extract_documents(db, [document_id]))[0]
 
+    @staticmethod
+    async def extract_documents(db: Session, document_ids: List[str]) -> List[ExtractionResultRead]:
+        db_docs = db.query(Document).filter(Document.id.in_(document_ids)).all()
+        docs_by_id = {doc.id: doc for doc in db_docs}
+
+        batch = []
+        for document_id in document_ids:
+            db_doc = docs_by_id.get(document_id)
+            if not db_doc:
+                raise ValueError("Document not found")
+
+            if not os.path.exists(db_doc.file_path):
+                raise ValueError("PDF file not found on disk")
+
+            batch.append(db_doc)
+
+        # Azure analyses are network-bound, so run them concurrently
+        outcomes = await asyncio.gather(
+            *(process_document(db_doc.file_path) for db_doc in batch),
+            return_exceptions=True
+        )
+
+        rows = []
+        first_error = None
+        for db_doc, outcome in zip(batch, outcomes):
+            if isinstance(outcome, Exception):
+                db_doc.status = "error"
+                first_error = first_error or outcome
+                continue
+
+            doc_type, extracted_data, warnings = outcome
+            if warnings:
+                # Mappers skip validation for typed Azure output; re-check inferred documents
+                try:
+                    extracted_data = type(extracted_data).model_validate(dict(extracted_data))
+                except ValueError as e:
+                    db_doc.status = "error"
+                    first_error = first_error or e
+                    continue
+            rows.append({
+                "id": str(uuid.uuid4()),
+                "document_id": db_doc.id,
+                "document_type": doc_type,
+                "structured_data": extracted_data.model_dump(mode="json"),
+                "warnings": "; ".join(warnings) if warnings else None,
+                # Naive UTC, the same form the DateTime column reads back
+                "created_at": datetime.now(UTC).replace(tzinfo=None),
+            })
+
+        # Successful extractions are kept even if another document in the batch failed
+        DocumentService._save_extraction_rows(db, rows)
+        db.commit()
+
+        if first_error is not None:
+            raise ValueError(f"Extraction failed: {str(first_error)}")
+
+        # Rows carry their own ids/timestamps, so no refresh round-trip is needed
+        return [ExtractionResultRead.model_validate(row) for row in rows]
+
+    @staticmethod
+    def _save_extraction_rows(db: Session, rows: List[dict]):
+        if not rows:
+            return
+
+        db.execute(insert(ExtractionResult), rows)
+        db.execute(
+            update(Document)
+            .where(Document.id.in_([row["document_id"] for row in rows]))
+            .values(status="parsed")
+        )
@@ -1,19 +1,23 @@
+from operator import attrgetter
 from typing import Union, Tuple, List, Optional, Any
 from pathlib import Path
 from app.services.document_intelligence import get_document_intelligence_service
 from app.schemas.schemas import W2Data, NEC1099Data, INT1099Data
 
+_GETTERS = {
+    value_attr: attrgetter(value_attr)
+    for value_attr in ("content", "value_string", "value_number", "value_object", "value_array")
+}
+
 def _get_field_value(fields: dict, field_name: str, value_attr: str = "content") -> Optional[Any]:
-    if field_name not in fields:
-        return None
-    field = fields[field_name]
-    return getattr(field, value_attr, None)
+    field = fields.get(field_name)
+    return _GETTERS[value_attr](field) if field is not None else None
 
 def map_w2_fields(fields: dict) -> W2Data:
     employee = _get_field_value(fields, "Employee", "value_object")
     employer = _get_field_value(fields, "Employer", "value_object")
     
-    return W2Data(
+    return W2Data.model_construct(
         tax_year=_get_field_value(fields, "TaxYear", "value_string"),
         employee_ssn=_get_field_value(employee, "SocialSecurityNumber", "value_string") if employee else None,
         employee_name=_get_field_value(employee, "Name", "value_string") if employee else None,
@@ -31,7 +35,7 @@ def map_1099nec_fields(fields: dict) -> NEC1099Data:
     payer = _get_field_value(fields, "Payer", "value_object")
     recipient = _get_field_value(fields, "Recipient", "value_object")
     
-    return NEC1099Data(
+    return NEC1099Data.model_construct(
         tax_year=_get_field_value(fields, "TaxYear", "value_string"),
         payer_tin=_get_field_value(payer, "TIN", "value_string") if payer else None,
         payer_name=_get_field_value(payer, "Name", "value_string") if payer else None,
@@ -50,7 +54,7 @@ def map_1099int_fields(fields: dict) -> INT1099Data:
     if transactions and len(transactions) > 0:
         first_transaction = getattr(transactions[0], "value_object", None)
     
-    return INT1099Data(
+    return INT1099Data.model_construct(
         tax_year=_get_field_value(fields, "TaxYear", "value_string"),
         payer_tin=_get_field_value(payer, "TIN", "value_string") if payer else None,
         payer_name=_get_field_value(payer, "Name", "value_string") if payer else None,
@@ -64,6 +68,13 @@ def map_1099int_fields(fields: dict) -> INT1099Data:
         foreign_tax_paid=_get_field_value(first_transaction, "Box6", "value_number") if first_transaction else None
     )
 
+# Keyed by the normalized document type (version suffix stripped)
+_MAPPERS = {
+    "tax.us.w2": map_w2_fields,
+    "tax.us.1099NEC": map_1099nec_fields,
+    "tax.us.1099INT": map_1099int_fields,
+}
+
 def _normalize_document_type(doc_type_raw: str) -> str:
     if doc_type_raw == "other":
         return "other"
@@ -78,20 +89,18 @@ def _infer_document_type_from_fields(fields: dict) -> str:
     if "WagesTipsAndOtherCompensation" in fields or "Employee" in fields:
         return "tax.us.w2"
     elif "Box1" in fields:
-        if "InterestIncome" in str(fields) or "Transactions" in fields:
+        if "Transactions" in fields or any(name.startswith("InterestIncome") for name in fields):
             return "tax.us.1099INT"
         return "tax.us.1099NEC"
     
     raise ValueError("Cannot determine document type from 'other' classification")
 
-def process_document(pdf_path: str | Path) -> Tuple[str, Union[W2Data, NEC1099Data, INT1099Data], List[str]]:
+async def process_document(pdf_path: str | Path) -> Tuple[str, Union[W2Data, NEC1099Data, INT1099Data], List[str]]:
     warnings = []
     
-    with open(pdf_path, "rb") as f:
-        pdf_bytes = f.read()
-    
     service = get_document_intelligence_service()
-    result = service.analyze_tax_document(pdf_bytes)
+    with open(pdf_path, "rb") as f:
+        result = await service.analyze_tax_document(f)
     
     if not result.documents:
         raise ValueError("No documents detected in PDF")
@@ -109,19 +118,12 @@ def process_document(pdf_path: str | Path) -> Tuple[str, Union[W2Data, NEC1099Da
         doc_type = _infer_document_type_from_fields(doc.fields)
     
     try:
-        if doc_type.startswith("tax.us.w2"):
-            extracted_data = map_w2_fields(doc.fields)
-            normalized_type = "tax.us.w2"
-        elif doc_type.startswith("tax.us.1099NEC"):
-            extracted_data = map_1099nec_fields(doc.fields)
-            normalized_type = "tax.us.1099NEC"
-        elif doc_type.startswith("tax.us.1099INT"):
-            extracted_data = map_1099int_fields(doc.fields)
-            normalized_type = "tax.us.1099INT"
-        else:
+        mapper = _MAPPERS.get(doc_type)
+        if mapper is None:
             raise ValueError(f"Unsupported document type: {doc_type_raw}")
+        extracted_data = mapper(doc.fields)
     except Exception as e:
         raise ValueError(f"Error mapping fields for {doc_type_raw}: {str(e)}")
     
-    return normalized_type, extracted_data, warnings
+    return doc_type, extracted_data, warnings
 
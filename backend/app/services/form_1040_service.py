@@ -1,15 +1,124 @@
+import hashlib
+import io
+import os
+import re
+import threading
+import orjson
+from collections import defaultdict
+from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
 from pypdf import PdfReader, PdfWriter
-from pypdf.generic import NameObject, NumberObject
-from typing import Dict
+from pypdf.generic import ArrayObject, NameObject, NumberObject
+from typing import Callable, Dict, List, Mapping, Optional, Tuple, Union
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.models.models import WorkflowState
 
+# Well-formed "ST 12345[-6789]" tail of a home address
+_STATE_ZIP_RE = re.compile(r"([A-Za-z]{2})\s+(\d{5}(?:-\d{4})?)")
+
+def _split_address(full_address: str) -> Tuple[str, str, str, str]:
+    """Split "street[, unit], city, ST 12345" into (street, city, state, zip).
+
+    A well-formed state/ZIP tail anchors the split from the right so extra commas
+    stay in the street; anything else is split left to right as street, city, state ZIP.
+    """
+    if "," not in full_address:
+        return full_address, "", "", ""
+    
+    parts = full_address.rsplit(",", 2)
+    if len(parts) == 3:
+        tail = _STATE_ZIP_RE.fullmatch(parts[2].strip())
+        if tail:
+            return parts[0].strip(), parts[1].strip(), tail.group(1), tail.group(2)
+    
+    parts = full_address.split(",")
+    state_zip = parts[2].split() if len(parts) > 2 else []
+    return (
+        parts[0].strip(),
+        parts[1].strip(),
+        state_zip[0] if state_zip else "",
+        state_zip[1] if len(state_zip) > 1 else "",
+    )
+
+def _fmt_money(amount: float) -> str:
+    return format(amount, ",.2f")
+
+def _fmt_positive_money(amount: float) -> str:
+    return format(amount, ",.2f") if amount > 0 else ""
+
+def _write_atomic(path: Path, data: bytes):
+    """Write data to a temp file with a single write, then rename it over path."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+@dataclass(frozen=True, kw_only=True)
+class _FormContext:
+    first_name: str
+    last_name: str
+    ssn: str
+    street: str
+    city: str
+    state: str
+    zip_code: str
+    occupation: str
+    phone: str
+    total_wages: float
+    total_interest: float
+    total_nec_income: float
+    gross_income: float
+    standard_deduction: float
+    taxable_income: float
+    tax_liability: float
+    total_withholding: float
+    status: str
+    refund_or_owed: float
+
+# FIELD_MAPPING key -> extractor over _FormContext; empty strings are left unfilled
+_FIELD_EXTRACTORS: Tuple[Tuple[str, Callable[[_FormContext], str]], ...] = (
+    ("filer_first_name", lambda ctx: ctx.first_name),
+    ("filer_last_name", lambda ctx: ctx.last_name),
+    ("filer_ssn", lambda ctx: ctx.ssn),
+    ("home_address", lambda ctx: ctx.street),
+    ("city", lambda ctx: ctx.city),
+    ("state", lambda ctx: ctx.state),
+    ("zip", lambda ctx: ctx.zip_code),
+    ("line_1a", lambda ctx: _fmt_positive_money(ctx.total_wages)),
+    ("line_1z", lambda ctx: _fmt_positive_money(ctx.total_wages)),
+    ("line_2b", lambda ctx: _fmt_positive_money(ctx.total_interest)),
+    ("line_8", lambda ctx: _fmt_positive_money(ctx.total_nec_income)),
+    ("line_9", lambda ctx: _fmt_money(ctx.gross_income)),
+    ("line_11", lambda ctx: _fmt_money(ctx.gross_income)),
+    ("line_12", lambda ctx: _fmt_money(ctx.standard_deduction)),
+    ("line_15", lambda ctx: _fmt_money(ctx.taxable_income)),
+    ("line_16", lambda ctx: _fmt_money(ctx.tax_liability)),
+    ("line_24", lambda ctx: _fmt_money(ctx.tax_liability)),
+    ("line_25a", lambda ctx: _fmt_money(ctx.total_withholding)),
+    ("line_33", lambda ctx: _fmt_money(ctx.total_withholding)),
+    ("line_34", lambda ctx: _fmt_money(ctx.refund_or_owed) if ctx.status == "refund" else ""),
+    ("line_37", lambda ctx: _fmt_money(ctx.refund_or_owed) if ctx.status == "owed" else ""),
+    ("occupation", lambda ctx: ctx.occupation),
+    ("phone", lambda ctx: ctx.phone),
+)
+
+def _build_field_specs(field_mapping: Mapping[str, str]) -> Tuple[Tuple[str, Callable[[_FormContext], str]], ...]:
+    return tuple((field_mapping[key], extractor) for key, extractor in _FIELD_EXTRACTORS)
+
 class Form1040Service:
     TEMPLATE_PATH = Path("storage/forms/f1040.pdf")
     OUTPUT_DIR = Path("storage/reports")
     
-    FIELD_MAPPING = {
+    # Read-only so _FIELD_SPECS, resolved from it at class creation, can't drift
+    FIELD_MAPPING: Mapping[str, str] = MappingProxyType({
         "filer_first_name": "f1_04[0]",
         "filer_last_name": "f1_05[0]",
         "filer_ssn": "f1_06[0]",
@@ -33,12 +142,26 @@ class Form1040Service:
         "line_37": "f2_28[0]",
         "occupation": "f2_33[0]",
         "phone": "f2_37[0]",
-    }
+    })
+    
+    # (PDF field name, extractor) pairs resolved once from FIELD_MAPPING
+    _FIELD_SPECS = _build_field_specs(FIELD_MAPPING)
+    
+    # PDF field name -> [(page index, position in that page's /Annots)], built on first fill
+    _FIELD_INDEX: Optional[Dict[str, List[Tuple[int, int]]]] = None
+    
+    # Template with left-aligned widgets, cloned into a writer and serialized once
+    _PROTOTYPE_BYTES: Optional[bytes] = None
+    # Digest of _PROTOTYPE_BYTES; part of the fill hash so a new template invalidates old PDFs
+    _PROTOTYPE_DIGEST: Optional[bytes] = None
+    _PROTOTYPE_LOCK = threading.Lock()
     
     @classmethod
     def generate_1040(cls, session_id: str, db: Session) -> Path:
-        workflow_state = db.query(WorkflowState).filter(
-            WorkflowState.session_id == session_id
+        # Plain row select: only two columns are needed, not a tracked ORM instance
+        workflow_state = db.execute(
+            select(WorkflowState.status, WorkflowState.state_data)
+            .where(WorkflowState.session_id == session_id)
         ).first()
         
         allowed_statuses = {"validated", "complete"}
@@ -69,72 +192,52 @@ class Form1040Service:
         filing_status: str
     ) -> Dict[str, str]:
         full_name = personal_info.get("filer_name", "")
-        name_parts = full_name.split(" ", 1)
-        first_name = name_parts[0] if name_parts else ""
-        last_name = name_parts[1] if len(name_parts) > 1 else ""
-        
-        full_address = personal_info.get("home_address", "")
-        street = ""
-        city = ""
-        state = ""
-        zip_code = ""
-        
-        if "," in full_address:
-            parts = full_address.split(",")
-            street = parts[0].strip() if len(parts) > 0 else ""
-            if len(parts) > 1:
-                city = parts[1].strip()
-            if len(parts) > 2:
-                state_zip = parts[2].strip().split()
-                if len(state_zip) > 0:
-                    state = state_zip[0]
-                if len(state_zip) > 1:
-                    zip_code = state_zip[1]
-        else:
-            street = full_address
-        
-        total_wages = aggregated_data.get("total_wages", 0)
-        total_interest = aggregated_data.get("total_interest", 0)
-        total_nec_income = aggregated_data.get("total_nec_income", 0)
-        gross_income = calc_result.get("gross_income", 0)
-        
-        field_values = {
-            cls.FIELD_MAPPING["filer_first_name"]: first_name,
-            cls.FIELD_MAPPING["filer_last_name"]: last_name,
-            cls.FIELD_MAPPING["filer_ssn"]: personal_info.get("filer_ssn", ""),
-            cls.FIELD_MAPPING["home_address"]: street,
-            cls.FIELD_MAPPING["city"]: city,
-            cls.FIELD_MAPPING["state"]: state,
-            cls.FIELD_MAPPING["zip"]: zip_code,
-            cls.FIELD_MAPPING["line_1a"]: f"{total_wages:,.2f}" if total_wages > 0 else "",
-            cls.FIELD_MAPPING["line_1z"]: f"{total_wages:,.2f}" if total_wages > 0 else "",
-            cls.FIELD_MAPPING["line_2b"]: f"{total_interest:,.2f}" if total_interest > 0 else "",
-            cls.FIELD_MAPPING["line_8"]: f"{total_nec_income:,.2f}" if total_nec_income > 0 else "",
-            cls.FIELD_MAPPING["line_9"]: f"{gross_income:,.2f}",
-            cls.FIELD_MAPPING["line_11"]: f"{gross_income:,.2f}",
-            cls.FIELD_MAPPING["line_12"]: f"{calc_result.get('standard_deduction', 0):,.2f}",
-            cls.FIELD_MAPPING["line_15"]: f"{calc_result.get('taxable_income', 0):,.2f}",
-            cls.FIELD_MAPPING["line_16"]: f"{calc_result.get('tax_liability', 0):,.2f}",
-            cls.FIELD_MAPPING["line_24"]: f"{calc_result.get('tax_liability', 0):,.2f}",
-            cls.FIELD_MAPPING["line_25a"]: f"{calc_result.get('total_withholding', 0):,.2f}",
-            cls.FIELD_MAPPING["line_33"]: f"{calc_result.get('total_withholding', 0):,.2f}",
-            cls.FIELD_MAPPING["occupation"]: personal_info.get("occupation", ""),
-            cls.FIELD_MAPPING["phone"]: personal_info.get("phone", ""),
-        }
+        first_name, _, last_name = full_name.partition(" ")
         
-        status = calc_result.get("status", "")
-        refund_or_owed = calc_result.get("refund_or_owed", 0)
+        street, city, state, zip_code = _split_address(personal_info.get("home_address", ""))
         
-        if status == "refund":
-            field_values[cls.FIELD_MAPPING["line_34"]] = f"{refund_or_owed:,.2f}"
-        elif status == "owed":
-            field_values[cls.FIELD_MAPPING["line_37"]] = f"{refund_or_owed:,.2f}"
+        ctx = _FormContext(
+            first_name=first_name,
+            last_name=last_name,
+            ssn=personal_info.get("filer_ssn", ""),
+            street=street,
+            city=city,
+            state=state,
+            zip_code=zip_code,
+            occupation=personal_info.get("occupation", ""),
+            phone=personal_info.get("phone", ""),
+            total_wages=float(aggregated_data.get("total_wages", 0)),
+            total_interest=float(aggregated_data.get("total_interest", 0)),
+            total_nec_income=float(aggregated_data.get("total_nec_income", 0)),
+            gross_income=float(calc_result.get("gross_income", 0)),
+            standard_deduction=float(calc_result.get("standard_deduction", 0)),
+            taxable_income=float(calc_result.get("taxable_income", 0)),
+            tax_liability=float(calc_result.get("tax_liability", 0)),
+            total_withholding=float(calc_result.get("total_withholding", 0)),
+            status=calc_result.get("status", ""),
+            refund_or_owed=float(calc_result.get("refund_or_owed", 0)),
+        )
         
-        return field_values
+        return {
+            field_name: value
+            for field_name, extractor in cls._FIELD_SPECS
+            if (value := extractor(ctx))
+        }
     
     @classmethod
-    def _fill_pdf(cls, session_id: str, field_values: Dict[str, str], filing_status: str) -> Path:
-        reader = PdfReader(cls.TEMPLATE_PATH)
+    def _get_prototype_bytes(cls) -> bytes:
+        if cls._PROTOTYPE_BYTES is None:
+            with cls._PROTOTYPE_LOCK:
+                if cls._PROTOTYPE_BYTES is None:
+                    prototype = cls._build_prototype()
+                    cls._PROTOTYPE_DIGEST = hashlib.blake2b(prototype, digest_size=16).digest()
+                    cls._PROTOTYPE_BYTES = prototype
+        return cls._PROTOTYPE_BYTES
+    
+    @classmethod
+    def _build_prototype(cls) -> bytes:
+        # One read of the whole file; pypdf's many small seeks/reads then hit memory
+        reader = PdfReader(io.BytesIO(cls.TEMPLATE_PATH.read_bytes()))
         
         # Set text alignment to left-justified for all form fields in the reader
         for page_num, page in enumerate(reader.pages):
@@ -157,10 +260,68 @@ class Form1040Service:
         writer = PdfWriter()
         writer.clone_reader_document_root(reader)
         
-        if field_values:
-            writer.update_page_form_field_values(writer.pages[0], field_values, flatten=True)
-            if len(writer.pages) > 1:
-                writer.update_page_form_field_values(writer.pages[1], field_values, flatten=True)
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        return buffer.getvalue()
+    
+    @classmethod
+    def _get_field_index(cls, pdf: Union[PdfReader, PdfWriter]) -> Dict[str, List[Tuple[int, int]]]:
+        if cls._FIELD_INDEX is None:
+            field_index = defaultdict(list)
+            for page_index, page in enumerate(pdf.pages):
+                for annot_index, annot_ref in enumerate(page.get("/Annots") or []):
+                    annot_obj = annot_ref.get_object()
+                    name = annot_obj.get("/T")
+                    if name is None and "/Parent" in annot_obj:
+                        name = annot_obj["/Parent"].get_object().get("/T")
+                    if name is not None:
+                        field_index[str(name)].append((page_index, annot_index))
+            cls._FIELD_INDEX = dict(field_index)
+        return cls._FIELD_INDEX
+    
+    @classmethod
+    def _fill_pdf(cls, session_id: str, field_values: Dict[str, str], filing_status: str) -> Path:
+        cls.OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+        session_dir = cls.OUTPUT_DIR / session_id
+        session_dir.mkdir(exist_ok=True)
+        
+        output_path = session_dir / "Form_1040.pdf"
+        hash_path = output_path.with_suffix(".pdf.hash")
+        
+        prototype = cls._get_prototype_bytes()
+        
+        # Same template and field values as the last fill: the existing PDF is already correct
+        fill_hash = hashlib.blake2b(
+            cls._PROTOTYPE_DIGEST + orjson.dumps(field_values, option=orjson.OPT_SORT_KEYS),
+            digest_size=16
+        ).hexdigest()
+        if output_path.exists() and hash_path.exists() and hash_path.read_text() == fill_hash:
+            return output_path
+        
+        writer = PdfWriter(clone_from=io.BytesIO(prototype))
+        
+        # Group values and their widgets by page using the prebuilt index
+        field_index = cls._get_field_index(writer)
+        values_by_page = defaultdict(dict)
+        widgets_by_page = defaultdict(list)
+        for field_name, value in field_values.items():
+            for page_index, annot_index in field_index.get(field_name, ()):
+                values_by_page[page_index][field_name] = value
+                widgets_by_page[page_index].append(annot_index)
+        
+        for page_index, page_values in sorted(values_by_page.items()):
+            page = writer.pages[page_index]
+            # pypdf matches every annotation against every field; narrowing /Annots to
+            # the target widgets keeps that scan small. All annotations are removed below.
+            annots = page["/Annots"]
+            page[NameObject("/Annots")] = ArrayObject(annots[i] for i in widgets_by_page[page_index])
+            # The AcroForm is dropped below, so don't ask viewers to regenerate appearances
+            writer.update_page_form_field_values(
+                page,
+                page_values,
+                auto_regenerate=False,
+                flatten=True
+            )
         
         # Remove interactive form fields after flattening their values
         for page in writer.pages:
@@ -174,13 +335,9 @@ class Form1040Service:
         except (AttributeError, KeyError):
             pass
         
-        cls.OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-        session_dir = cls.OUTPUT_DIR / session_id
-        session_dir.mkdir(exist_ok=True)
-        
-        output_path = session_dir / "Form_1040.pdf"
-        with open(output_path, "wb") as output_file:
-            writer.write(output_file)
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        _write_atomic(output_path, buffer.getbuffer())
+        _write_atomic(hash_path, fill_hash.encode())
         
         return output_path
-
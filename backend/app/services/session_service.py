@@ -1,8 +1,12 @@
+import io
 import os
 import shutil
 import uuid
-from typing import List
-from sqlalchemy.orm import Session
+from datetime import datetime, UTC
+from tempfile import SpooledTemporaryFile
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, List, Optional, Tuple
+from sqlalchemy.orm import Session, selectinload
 from fastapi import UploadFile
 from app.models.models import UploadSession, Document
 from app.schemas.schemas import UploadResponse, DocumentRead
@@ -10,64 +14,129 @@ from app.schemas.schemas import UploadResponse, DocumentRead
 UPLOAD_DIR = "storage/uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+COPY_BUFSIZE = 1024 * 1024
+MAX_SAVE_WORKERS = 8
+
+def _copy_upload(source: BinaryIO, destination: BinaryIO):
+    # Only a spool that already rolled over to disk has a real fd; fileno() on one
+    # still in memory would first write the whole buffered upload out to disk.
+    if not isinstance(source, SpooledTemporaryFile) or isinstance(source._file, io.BytesIO):
+        shutil.copyfileobj(source, destination, COPY_BUFSIZE)
+        return
+    
+    source_start = source.tell()
+    destination_start = destination.tell()
+    try:
+        destination.flush()
+        in_fd = source.fileno()
+        out_fd = destination.fileno()
+        offset = source_start
+        while True:
+            sent = os.sendfile(out_fd, in_fd, offset, COPY_BUFSIZE)
+            if sent == 0:
+                break
+            offset += sent
+        source.seek(offset)
+    except OSError:
+        # Fall back to a buffered copy from where we started
+        destination.seek(destination_start)
+        destination.truncate()
+        source.seek(source_start)
+        shutil.copyfileobj(source, destination, COPY_BUFSIZE)
+
+def _save_upload(task: Tuple[str, str, UploadFile]) -> Optional[int]:
+    """Write one upload to disk; returns its size, or None if it is not a PDF or the write failed."""
+    doc_id, file_path, file = task
+    
+    # The first chunk doubles as the magic-header check, so no seek back is needed
+    first_chunk = file.file.read(COPY_BUFSIZE)
+    if not first_chunk.startswith(b'%PDF'):
+        return None
+    
+    try:
+        with open(file_path, "wb") as buffer:
+            buffer.write(first_chunk)
+            _copy_upload(file.file, buffer)
+        
+        return os.path.getsize(file_path)
+    
+    except Exception:
+        return None
+
+def _remove_tree(path: str):
+    """Delete a directory tree with one scandir pass per directory; a missing path is ignored."""
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    _remove_tree(entry.path)
+                else:
+                    os.unlink(entry.path)
+        os.rmdir(path)
+    except FileNotFoundError:
+        pass
+
 class SessionService:
     @staticmethod
     def create_session_with_files(db: Session, files: List[UploadFile]) -> UploadResponse:
-        session_id = str(uuid.uuid4())
+        # One getrandom call for the session id and every document id
+        random_bytes = os.urandom(16 * (len(files) + 1))
+        new_ids = (
+            str(uuid.UUID(bytes=random_bytes[offset:offset + 16], version=4))
+            for offset in range(0, len(random_bytes), 16)
+        )
+        session_id = next(new_ids)
         db_session = UploadSession(id=session_id, status="pending")
         db.add(db_session)
-        db.commit()
-        db.refresh(db_session)
 
         session_dir = os.path.join(UPLOAD_DIR, session_id)
         os.makedirs(session_dir, exist_ok=True)
 
-        uploaded_documents = []
-
+        tasks = []
         for file in files:
-            header = file.file.read(5)
-            file.file.seek(0)
-            
-            if header[:4] != b'%PDF':
-                continue
-            
             if file.content_type != "application/pdf":
                 continue
             
-            doc_id = str(uuid.uuid4())
-            file_path = os.path.join(session_dir, f"{doc_id}.pdf")
-            
-            try:
-                with open(file_path, "wb") as buffer:
-                    shutil.copyfileobj(file.file, buffer)
-                
-                file_size = os.path.getsize(file_path)
-                
-                db_doc = Document(
-                    id=doc_id,
-                    session_id=session_id,
-                    filename=file.filename,
-                    file_path=file_path,
-                    file_size=file_size,
-                    status="uploaded"
-                )
-                db.add(db_doc)
-                uploaded_documents.append(db_doc)
-                
-            except Exception:
-                continue
-
-        db.commit()
-        db.refresh(db_session)
+            doc_id = next(new_ids)
+            tasks.append((doc_id, os.path.join(session_dir, f"{doc_id}.pdf"), file))
         
-        return UploadResponse(
-            session_id=db_session.id,
+        # Disk writes release the GIL, so save the files concurrently
+        file_sizes = []
+        if tasks:
+            with ThreadPoolExecutor(max_workers=min(MAX_SAVE_WORKERS, len(tasks))) as executor:
+                file_sizes = list(executor.map(_save_upload, tasks))
+        
+        # Naive UTC, the same form the DateTime column reads back in get_session
+        uploaded_at = datetime.now(UTC).replace(tzinfo=None)
+        uploaded_documents = [
+            Document(
+                id=doc_id,
+                session_id=session_id,
+                filename=file.filename,
+                file_path=file_path,
+                file_size=file_size,
+                upload_timestamp=uploaded_at,
+                status="uploaded"
+            )
+            for (doc_id, file_path, file), file_size in zip(tasks, file_sizes)
+            if file_size is not None
+        ]
+        db.add_all(uploaded_documents)
+        
+        # Every column is set in Python, so build the response before commit expires the objects
+        response = UploadResponse(
+            session_id=session_id,
             documents=[DocumentRead.model_validate(doc) for doc in uploaded_documents]
         )
+        db.commit()
+        
+        return response
     
     @staticmethod
     def get_session(db: Session, session_id: str) -> UploadResponse:
-        db_session = db.query(UploadSession).filter(UploadSession.id == session_id).first()
+        db_session = db.query(UploadSession).options(
+            selectinload(UploadSession.documents)
+        ).filter(UploadSession.id == session_id).first()
         if not db_session:
             raise ValueError("Session not found")
         
@@ -83,12 +152,11 @@ class SessionService:
             return
         
         session_dir = os.path.join(UPLOAD_DIR, session_id)
-        if os.path.exists(session_dir):
-            shutil.rmtree(session_dir)
-        
         report_dir = os.path.join("storage/reports", session_id)
-        if os.path.exists(report_dir):
-            shutil.rmtree(report_dir)
+        
+        # The two trees are independent, so clear them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(_remove_tree, (session_dir, report_dir)))
         
         db.delete(session)
         db.commit()
@@ -1,71 +1,57 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from app.models.models import ExtractionResult
-from app.schemas.schemas import TaxInput, W2Data, NEC1099Data, INT1099Data
+from app.schemas.schemas import TaxInput
 
-def aggregate_w2_data(extraction_results: list[ExtractionResult]) -> tuple[float, float]:
-    total_wages = 0.0
-    total_withholding = 0.0
-    
-    for result in extraction_results:
-        if result.document_type == "tax.us.w2":
-            try:
-                w2_data = W2Data(**result.structured_data)
-                
-                if w2_data.wages_tips_other_compensation:
-                    total_wages += w2_data.wages_tips_other_compensation
-                
-                if w2_data.federal_income_tax_withheld:
-                    total_withholding += w2_data.federal_income_tax_withheld
-                    
-            except Exception:
-                continue
-    
-    return total_wages, total_withholding
-
-def aggregate_1099nec_data(extraction_results: list[ExtractionResult]) -> tuple[float, float]:
-    total_nec_income = 0.0
-    total_withholding = 0.0
-    
-    for result in extraction_results:
-        if result.document_type == "tax.us.1099NEC":
-            try:
-                nec_data = NEC1099Data(**result.structured_data)
-                
-                if nec_data.nonemployee_compensation:
-                    total_nec_income += nec_data.nonemployee_compensation
-                
-                if nec_data.federal_income_tax_withheld:
-                    total_withholding += nec_data.federal_income_tax_withheld
-                    
-            except Exception:
-                continue
-    
-    return total_nec_income, total_withholding
+# document_type -> [(structured_data key, TaxInput total)]
+_AGGREGATORS = {
+    "tax.us.w2": [
+        ("wages_tips_other_compensation", "total_wages"),
+        ("federal_income_tax_withheld", "total_withholding"),
+    ],
+    "tax.us.1099NEC": [
+        ("nonemployee_compensation", "total_nec_income"),
+        ("federal_income_tax_withheld", "total_withholding"),
+    ],
+    "tax.us.1099INT": [
+        ("interest_income", "total_interest"),
+        ("federal_income_tax_withheld", "total_withholding"),
+    ],
+}
 
-def aggregate_1099int_data(extraction_results: list[ExtractionResult]) -> tuple[float, float]:
-    total_interest = 0.0
-    total_withholding = 0.0
+def aggregate_extraction_results(extraction_results: list[ExtractionResult]) -> dict[str, float]:
+    totals = {
+        "total_wages": 0.0,
+        "total_interest": 0.0,
+        "total_nec_income": 0.0,
+        "total_withholding": 0.0,
+    }
     
     for result in extraction_results:
-        if result.document_type == "tax.us.1099INT":
-            try:
-                int_data = INT1099Data(**result.structured_data)
-                
-                if int_data.interest_income:
-                    total_interest += int_data.interest_income
-                
-                if int_data.federal_income_tax_withheld:
-                    total_withholding += int_data.federal_income_tax_withheld
-                    
-            except Exception:
-                continue
+        field_totals = _AGGREGATORS.get(result.document_type)
+        if field_totals is None:
+            continue
+        
+        # structured_data was validated at extraction time; read the numbers directly
+        structured_data = result.structured_data or {}
+        try:
+            amounts = [
+                (total_name, float(structured_data.get(field_name) or 0))
+                for field_name, total_name in field_totals
+            ]
+        except (TypeError, ValueError):
+            continue
+        
+        for total_name, amount in amounts:
+            totals[total_name] += amount
     
-    return total_interest, total_withholding
+    return totals
 
 def aggregate_tax_data(session_id: str, db: Session) -> TaxInput:
     from app.models.models import UploadSession, Document
     
-    db_session = db.query(UploadSession).filter(UploadSession.id == session_id).first()
+    db_session = db.query(UploadSession).options(
+        selectinload(UploadSession.documents).selectinload(Document.extraction_result)
+    ).filter(UploadSession.id == session_id).first()
     if not db_session:
         raise ValueError(f"Session {session_id} not found")
     
@@ -77,14 +63,5 @@ def aggregate_tax_data(session_id: str, db: Session) -> TaxInput:
     if not extraction_results:
         raise ValueError(f"No extraction results found for session {session_id}")
     
-    w2_wages, w2_withholding = aggregate_w2_data(extraction_results)
-    nec_income, nec_withholding = aggregate_1099nec_data(extraction_results)
-    interest, int_withholding = aggregate_1099int_data(extraction_results)
-    
-    return TaxInput(
-        total_wages=w2_wages,
-        total_interest=interest,
-        total_nec_income=nec_income,
-        total_withholding=w2_withholding + nec_withholding + int_withholding
-    )
+    return TaxInput(**aggregate_extraction_results(extraction_results))
 
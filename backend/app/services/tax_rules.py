@@ -1,4 +1,5 @@
 from typing import Literal
+from bisect import bisect_left
 from decimal import Decimal
 
 FilingStatus = Literal["single", "married_filing_jointly", "head_of_household"]
@@ -39,55 +40,104 @@ TAX_BRACKETS = {
     ],
 }
 
+def _to_cents(amount: Decimal) -> int:
+    return int((amount * 100).to_integral_value())
+
+def _from_cents(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-2)
+
+def _round_half_even_div(numerator: int, denominator: int) -> int:
+    quotient, remainder = divmod(numerator, denominator)
+    if remainder * 2 > denominator or (remainder * 2 == denominator and quotient % 2):
+        quotient += 1
+    return quotient
+
+def _build_bracket_table(
+    brackets: list[tuple[Decimal, Decimal | None]]
+) -> tuple[list[int], list[int], list[int], list[int]]:
+    """Per bracket, in integer cents: finite upper limits (for bisect), lower limit,
+    rate in whole percent, and tax owed below the lower limit scaled by 100."""
+    upper_limits = []
+    lower_limits = []
+    rates = []
+    base_taxes = []
+    cumulative_tax = 0
+    previous_limit = 0
+    
+    for rate, upper_limit in brackets:
+        rate_percent = int(rate * 100)
+        lower_limits.append(previous_limit)
+        rates.append(rate_percent)
+        base_taxes.append(cumulative_tax)
+        
+        if upper_limit is not None:
+            upper_cents = _to_cents(upper_limit)
+            upper_limits.append(upper_cents)
+            cumulative_tax += (upper_cents - previous_limit) * rate_percent
+            previous_limit = upper_cents
+    
+    return upper_limits, lower_limits, rates, base_taxes
+
+_STANDARD_DEDUCTIONS_CENTS = {
+    filing_status: _to_cents(deduction)
+    for filing_status, deduction in STANDARD_DEDUCTIONS.items()
+}
+
+_BRACKET_TABLES = {
+    filing_status: _build_bracket_table(brackets)
+    for filing_status, brackets in TAX_BRACKETS.items()
+}
+
 def get_standard_deduction(filing_status: FilingStatus) -> Decimal:
     if filing_status not in STANDARD_DEDUCTIONS:
         raise ValueError(f"Invalid filing status: {filing_status}")
     
     return STANDARD_DEDUCTIONS[filing_status]
 
-def calculate_taxable_income(gross_income: Decimal, filing_status: FilingStatus) -> Decimal:
-    standard_deduction = get_standard_deduction(filing_status)
-    taxable_income = gross_income - standard_deduction
+def get_standard_deduction_cents(filing_status: FilingStatus) -> int:
+    if filing_status not in _STANDARD_DEDUCTIONS_CENTS:
+        raise ValueError(f"Invalid filing status: {filing_status}")
     
-    return max(Decimal("0"), taxable_income)
+    return _STANDARD_DEDUCTIONS_CENTS[filing_status]
 
-def calculate_tax_liability(taxable_income: Decimal, filing_status: FilingStatus) -> Decimal:
-    if filing_status not in TAX_BRACKETS:
+def calculate_taxable_income_cents(gross_income_cents: int, filing_status: FilingStatus) -> int:
+    if filing_status not in _STANDARD_DEDUCTIONS_CENTS:
         raise ValueError(f"Invalid filing status: {filing_status}")
     
-    if taxable_income <= 0:
-        return Decimal("0")
+    return max(0, gross_income_cents - _STANDARD_DEDUCTIONS_CENTS[filing_status])
+
+def calculate_tax_liability_cents(taxable_income_cents: int, filing_status: FilingStatus) -> int:
+    if filing_status not in _BRACKET_TABLES:
+        raise ValueError(f"Invalid filing status: {filing_status}")
     
-    brackets = TAX_BRACKETS[filing_status]
-    total_tax = Decimal("0")
-    remaining_income = taxable_income
-    previous_limit = Decimal("0")
+    if taxable_income_cents <= 0:
+        return 0
     
-    for rate, upper_limit in brackets:
-        if remaining_income <= 0:
-            break
-        
-        if upper_limit is None:
-            chunk = remaining_income
-        else:
-            chunk = min(remaining_income, upper_limit - previous_limit)
-        
-        tax_for_chunk = chunk * rate
-        total_tax += tax_for_chunk
-        remaining_income -= chunk
-        
-        if upper_limit is not None:
-            previous_limit = upper_limit
+    upper_limits, lower_limits, rates, base_taxes = _BRACKET_TABLES[filing_status]
+    i = bisect_left(upper_limits, taxable_income_cents)
+    scaled_tax = base_taxes[i] + (taxable_income_cents - lower_limits[i]) * rates[i]
     
-    return total_tax.quantize(Decimal("0.01"))
+    return _round_half_even_div(scaled_tax, 100)
 
-def calculate_refund_or_owed(tax_liability: Decimal, total_withholding: Decimal) -> tuple[Decimal, str]:
-    balance = tax_liability - total_withholding
+def calculate_refund_or_owed_cents(tax_liability_cents: int, total_withholding_cents: int) -> tuple[int, str]:
+    balance = tax_liability_cents - total_withholding_cents
     
     if balance < 0:
-        return (abs(balance).quantize(Decimal("0.01")), "refund")
+        return (-balance, "refund")
     elif balance > 0:
-        return (balance.quantize(Decimal("0.01")), "owed")
+        return (balance, "owed")
     else:
-        return (Decimal("0.00"), "even")
+        return (0, "even")
+
+def calculate_taxable_income(gross_income: Decimal, filing_status: FilingStatus) -> Decimal:
+    return _from_cents(calculate_taxable_income_cents(_to_cents(gross_income), filing_status))
 
+def calculate_tax_liability(taxable_income: Decimal, filing_status: FilingStatus) -> Decimal:
+    return _from_cents(calculate_tax_liability_cents(_to_cents(taxable_income), filing_status))
+
+def calculate_refund_or_owed(tax_liability: Decimal, total_withholding: Decimal) -> tuple[Decimal, str]:
+    amount_cents, status = calculate_refund_or_owed_cents(
+        _to_cents(tax_liability),
+        _to_cents(total_withholding)
+    )
+    return (_from_cents(amount_cents), status)
@@ -1,46 +1,48 @@
-from decimal import Decimal
 from sqlalchemy.orm import Session
 from app.schemas.schemas import TaxCalculationResult
 from app.services.tax_aggregator import aggregate_tax_data
 from app.services.tax_rules import (
-    calculate_taxable_income,
-    calculate_tax_liability,
-    calculate_refund_or_owed,
-    get_standard_deduction,
+    calculate_taxable_income_cents,
+    calculate_tax_liability_cents,
+    calculate_refund_or_owed_cents,
+    get_standard_deduction_cents,
     FilingStatus
 )
 
+def to_cents(amount: float) -> int:
+    return int(round(amount * 100))
+
 class TaxService:
     @staticmethod
     def calculate_tax(
-        session_id: str, 
-        filing_status: FilingStatus, 
+        session_id: str,
+        filing_status: FilingStatus,
         db: Session
     ) -> TaxCalculationResult:
         tax_input = aggregate_tax_data(session_id, db)
-        
-        gross_income = Decimal(str(
-            tax_input.total_wages + 
-            tax_input.total_interest + 
-            tax_input.total_nec_income
-        ))
-        
-        taxable_income = calculate_taxable_income(gross_income, filing_status)
-        tax_liability = calculate_tax_liability(taxable_income, filing_status)
-        total_withholding = Decimal(str(tax_input.total_withholding))
-        refund_or_owed_amount, status = calculate_refund_or_owed(
-            tax_liability, 
+
+        # All amounts are whole cents; convert once in and once out
+        gross_income = (
+            to_cents(tax_input.total_wages) +
+            to_cents(tax_input.total_interest) +
+            to_cents(tax_input.total_nec_income)
+        )
+
+        taxable_income = calculate_taxable_income_cents(gross_income, filing_status)
+        tax_liability = calculate_tax_liability_cents(taxable_income, filing_status)
+        total_withholding = to_cents(tax_input.total_withholding)
+        refund_or_owed_amount, status = calculate_refund_or_owed_cents(
+            tax_liability,
             total_withholding
         )
-        standard_deduction = get_standard_deduction(filing_status)
-        
+        standard_deduction = get_standard_deduction_cents(filing_status)
+
         return TaxCalculationResult(
-            gross_income=float(gross_income),
-            standard_deduction=float(standard_deduction),
-            taxable_income=float(taxable_income),
-            tax_liability=float(tax_liability),
-            total_withholding=float(total_withholding),
-            refund_or_owed=float(refund_or_owed_amount),
+            gross_income=gross_income / 100,
+            standard_deduction=standard_deduction / 100,
+            taxable_income=taxable_income / 100,
+            tax_liability=tax_liability / 100,
+            total_withholding=total_withholding / 100,
+            refund_or_owed=refund_or_owed_amount / 100,
             status=status
         )
-
@@ -1,40 +1,58 @@
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 from app.models.models import WorkflowState
 from app.agent.state import TaxState
 from datetime import datetime, UTC
 
+# Dialect-specific INSERT constructs that support ON CONFLICT ... DO UPDATE
+_UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
 class WorkflowStateService:
     @staticmethod
     def save_state(db: Session, session_id: str, state: TaxState) -> WorkflowState:
-        existing = db.query(WorkflowState).filter(
-            WorkflowState.session_id == session_id
-        ).first()
-        
-        if existing:
-            existing.state_data = dict(state)
-            existing.status = state["status"]
-            existing.updated_at = datetime.now(UTC)
-            db.commit()
-            db.refresh(existing)
-            return existing
-        else:
-            workflow_state = WorkflowState(
-                session_id=session_id,
-                state_data=dict(state),
-                status=state["status"]
+        # One INSERT ... ON CONFLICT (session_id) DO UPDATE instead of SELECT then UPDATE/INSERT
+        dialect = db.get_bind().dialect.name
+        insert = _UPSERT_INSERTS.get(dialect)
+        if insert is None:
+            raise NotImplementedError(
+                f"save_state has no upsert for the {dialect!r} database dialect; "
+                f"supported: {', '.join(_UPSERT_INSERTS)}"
             )
-            db.add(workflow_state)
-            db.commit()
-            db.refresh(workflow_state)
-            return workflow_state
+        stmt = insert(WorkflowState).values(
+            session_id=session_id,
+            state_data=state,
+            status=state["status"]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[WorkflowState.session_id],
+            set_={
+                "state_data": stmt.excluded.state_data,
+                "status": stmt.excluded.status,
+                "updated_at": datetime.now(UTC),
+            }
+        ).returning(WorkflowState)
+        
+        workflow_state = db.scalars(
+            stmt,
+            execution_options={"populate_existing": True}
+        ).one()
+        # RETURNING already loaded the written row; detach it so commit doesn't expire
+        # it and force a reload. The result reflects what this call wrote.
+        db.expunge(workflow_state)
+        db.commit()
+        return workflow_state
     
     @staticmethod
     def get_state(db: Session, session_id: str) -> TaxState:
-        workflow_state = db.query(WorkflowState).filter(
-            WorkflowState.session_id == session_id
+        # Column-only select: no identity map entry or loader events for a single JSON blob
+        row = db.execute(
+            select(WorkflowState.state_data).where(WorkflowState.session_id == session_id)
         ).first()
         
-        if workflow_state:
-            return workflow_state.state_data
+        if row:
+            return row.state_data
         return None
-
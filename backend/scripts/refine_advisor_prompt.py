@@ -1,3 +1,4 @@
+import asyncio
 import os
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
@@ -87,43 +88,37 @@ def test_prompts():
     # Attempt to use the user's requested model, fallback if needed or let library handle
     # Using 'gpt-4o-mini' as a safe high-quality proxy for testing the prompt logic
     try:
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7)
+        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7, max_retries=2)
     except:
-        llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0.7)
+        llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0.7, max_retries=2)
     
-    print("--- TESTING SCENARIO 1: REFUND ---")
+    chain1 = ChatPromptTemplate.from_template(PROMPT_V1) | llm
+    chain2 = ChatPromptTemplate.from_template(PROMPT_V2) | llm
+    chain3 = ChatPromptTemplate.from_template(PROMPT_V3) | llm
     
-    print("\n--- Prompt V1 (Base) ---")
-    p1 = ChatPromptTemplate.from_template(PROMPT_V1)
-    chain1 = p1 | llm
-    try:
-        print(chain1.invoke(SCENARIO_REFUND).content)
-    except Exception as e:
-        print(f"Error invoking chain 1: {e}")
+    # (header, chain, scenario, error label), printed in this order
+    runs = [
+        ("--- TESTING SCENARIO 1: REFUND ---\n\n--- Prompt V1 (Base) ---", chain1, SCENARIO_REFUND, "chain 1"),
+        ("\n--- Prompt V2 (Structured) ---", chain2, SCENARIO_REFUND, "chain 2"),
+        ("\n--- Prompt V3 (Final) ---", chain3, SCENARIO_REFUND, "chain 3"),
+        ("\n\n--- TESTING SCENARIO 2: OWED ---\n\n--- Prompt V3 (Final) Only ---", chain3, SCENARIO_OWED, "chain 3 (Owed)"),
+    ]
     
-    print("\n--- Prompt V2 (Structured) ---")
-    p2 = ChatPromptTemplate.from_template(PROMPT_V2)
-    chain2 = p2 | llm
-    try:
-        print(chain2.invoke(SCENARIO_REFUND).content)
-    except Exception as e:
-        print(f"Error invoking chain 2: {e}")
+    # The calls are independent, so send them all at once instead of one round trip each
+    async def invoke_all():
+        return await asyncio.gather(
+            *(chain.ainvoke(scenario) for _, chain, scenario, _ in runs),
+            return_exceptions=True
+        )
     
-    print("\n--- Prompt V3 (Final) ---")
-    p3 = ChatPromptTemplate.from_template(PROMPT_V3)
-    chain3 = p3 | llm
-    try:
-        print(chain3.invoke(SCENARIO_REFUND).content)
-    except Exception as e:
-        print(f"Error invoking chain 3: {e}")
-
-    print("\n\n--- TESTING SCENARIO 2: OWED ---")
-    print("\n--- Prompt V3 (Final) Only ---")
-    try:
-        print(chain3.invoke(SCENARIO_OWED).content)
-    except Exception as e:
-        print(f"Error invoking chain 3 (Owed): {e}")
+    results = asyncio.run(invoke_all())
+    
+    for (header, _, _, label), result in zip(runs, results):
+        print(header)
+        if isinstance(result, Exception):
+            print(f"Error invoking {label}: {result}")
+        else:
+            print(result.content)
 
 if __name__ == "__main__":
     test_prompts()
-
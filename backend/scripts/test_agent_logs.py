@@ -1,6 +1,8 @@
-import requests
-import json
+import asyncio
+import aiohttp
+import orjson
 import os
+import sys
 from pathlib import Path
 import time
 
@@ -9,42 +11,58 @@ BASE_URL = "http://localhost:8000/api"
 SAMPLE_DOCS_DIR = Path("../sample_docs")
 W2_FILE = SAMPLE_DOCS_DIR / "PYW224S_EE.pdf"
 
-def test_agent_logs():
-    print("Starting Agent Log Test...")
+def post_json(http, url, obj):
+    # Returned unawaited so callers can use it as "async with" and release the connection
+    return http.post(url, data=orjson.dumps(obj), headers={"Content-Type": "application/json"})
+
+async def rjson(resp):
+    return orjson.loads(await resp.read())
+
+def run_printer(run: int):
+    # Concurrent runs share stdout, so tag every output line with its run
+    prefix = f"[run {run}] "
+    def out(text=""):
+        print("\n".join(prefix + line for line in str(text).split("\n")))
+    return out
+
+async def test_agent_logs(http: aiohttp.ClientSession, out=print):
+    out("Starting Agent Log Test...")
     
     # 1. Create Session & Upload File
     if not W2_FILE.exists():
-        print(f"Error: Sample file not found at {W2_FILE}")
+        out(f"Error: Sample file not found at {W2_FILE}")
         return
 
-    print(f"Uploading {W2_FILE.name}...")
-    files = [('files', ('w2.pdf', open(W2_FILE, 'rb'), 'application/pdf'))]
-    
+    out(f"Uploading {W2_FILE.name}...")
     try:
-        resp = requests.post(f"{BASE_URL}/sessions", files=files)
-        resp.raise_for_status()
-        data = resp.json()
+        with open(W2_FILE, 'rb') as w2:
+            form = aiohttp.FormData()
+            form.add_field('files', w2, filename='w2.pdf', content_type='application/pdf')
+            async with http.post(f"{BASE_URL}/sessions", data=form) as resp:
+                resp.raise_for_status()
+                data = await rjson(resp)
         session_id = data["session_id"]
         document_id = data["documents"][0]["id"]
-        print(f"Session created: {session_id}")
+        out(f"Session created: {session_id}")
     except Exception as e:
-        print(f"Upload failed: {str(e)}")
+        out(f"Upload failed: {str(e)}")
         return
 
     # 1.5 Trigger Extraction
-    print(f"Extracting document {document_id}...")
+    out(f"Extracting document {document_id}...")
     try:
-        resp = requests.post(f"{BASE_URL}/documents/{document_id}/extract")
-        resp.raise_for_status()
-        print("Extraction complete.")
+        async with http.post(f"{BASE_URL}/documents/{document_id}/extract") as extract_resp:
+            extract_resp.raise_for_status()
+        out("Extraction complete.")
     except Exception as e:
-        print(f"Extraction failed: {str(e)}")
+        out(f"Extraction failed: {str(e)}")
         # Cleanup
-        requests.delete(f"{BASE_URL}/sessions/{session_id}")
+        async with http.delete(f"{BASE_URL}/sessions/{session_id}"):
+            pass
         return
 
     # 2. Run Process (Agent Workflow)
-    print("\nRunning Agent Workflow...")
+    out("\nRunning Agent Workflow...")
     # Minimal payload that should satisfy mandatory fields combined with the W2
     payload = {
         "filing_status": "single",
@@ -58,61 +76,69 @@ def test_agent_logs():
         }
     }
     
+    body = None
     try:
-        resp = requests.post(f"{BASE_URL}/sessions/{session_id}/process", json=payload)
-        resp.raise_for_status()
-        result = resp.json()
+        async with post_json(http, f"{BASE_URL}/sessions/{session_id}/process", payload) as resp:
+            body = await resp.read()
+            resp.raise_for_status()
+        result = orjson.loads(body)
         
         # 3. Analyze Logs
         logs = result.get("logs", [])
         status = result.get("status")
         
-        print(f"\nWorkflow Status: {status}")
-        print(f"Logs Received: {len(logs)}\n")
+        out(f"\nWorkflow Status: {status}")
+        out(f"Logs Received: {len(logs)}\n")
         
-        print("-" * 100)
-        print(f"{'TIMESTAMP':<12} | {'NODE':<12} | {'TYPE':<8} | MESSAGE")
-        print("-" * 100)
+        out("-" * 100)
+        out(f"{'TIMESTAMP':<12} | {'NODE':<12} | {'TYPE':<8} | MESSAGE")
+        out("-" * 100)
         
+        fmt = "{:<12} | {:<12} | {:<8} | {}".format
         for log in logs:
-            # Format timestamp to show time only
-            time_str = log['timestamp'].split('T')[1][:8]
-            print(f"{time_str:<12} | {log['node']:<12} | {log['type']:<8} | {log['message']}")
+            # ISO-8601 "YYYY-MM-DDTHH:MM:SS...": slice out the time only
+            out(fmt(log['timestamp'][11:19], log['node'], log['type'], log['message']))
             
-        print("-" * 100)
+        out("-" * 100)
         
         # 4. Verify specific log content
-        has_aggregator = any(l['node'] == 'aggregator' for l in logs)
-        has_calculator = any(l['node'] == 'calculator' for l in logs)
-        has_validator = any(l['node'] == 'validator' for l in logs)
-        has_advisor = any(l['node'] == 'advisor' for l in logs)
+        # One pass over the logs, then check coverage against the set of nodes seen
+        seen_nodes = {l['node'] for l in logs}
+        missing_nodes = [n for n in ('aggregator', 'calculator', 'validator', 'advisor') if n not in seen_nodes]
         
-        if has_aggregator and has_calculator and has_validator and has_advisor:
-            print("\nSUCCESS: Logs from all nodes (aggregator, calculator, validator, advisor) detected!")
+        if not missing_nodes:
+            out("\nSUCCESS: Logs from all nodes (aggregator, calculator, validator, advisor) detected!")
         else:
-            print("\nWARNING: Missing logs from some nodes.")
-            if not has_aggregator: print("   - Missing Aggregator logs")
-            if not has_calculator: print("   - Missing Calculator logs")
-            if not has_validator: print("   - Missing Validator logs")
-            if not has_advisor: print("   - Missing Advisor logs")
+            out("\nWARNING: Missing logs from some nodes.")
+            for node in missing_nodes:
+                out(f"   - Missing {node.capitalize()} logs")
             
         # 5. Check Advisor Feedback
         feedback = result.get("advisor_feedback")
         if feedback:
-            print("\nAdvisor Feedback Received:")
-            print("-" * 60)
-            print(feedback)
-            print("-" * 60)
+            out("\nAdvisor Feedback Received:")
+            out("-" * 60)
+            out(feedback)
+            out("-" * 60)
         else:
-            print("\nError: No advisor feedback in response.")
-        requests.delete(f"{BASE_URL}/sessions/{session_id}")
-        print(f"\nSession {session_id} cleaned up.")
+            out("\nError: No advisor feedback in response.")
+        async with http.delete(f"{BASE_URL}/sessions/{session_id}"):
+            pass
+        out(f"\nSession {session_id} cleaned up.")
             
     except Exception as e:
-        print(f"Processing failed: {str(e)}")
-        if 'resp' in locals():
-            print(resp.text)
+        out(f"Processing failed: {str(e)}")
+        if body is not None:
+            out(body.decode(errors="replace"))
+
+async def main(runs: int = 1):
+    # One pooled client for every call; pass a count to run several sessions at once
+    async with aiohttp.ClientSession() as http:
+        if runs == 1:
+            await test_agent_logs(http)
+        else:
+            await asyncio.gather(*(test_agent_logs(http, run_printer(run)) for run in range(1, runs + 1)))
 
 if __name__ == "__main__":
-    test_agent_logs()
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1))
 
@@ -1,7 +1,9 @@
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from pprint import pprint
 import sys
+import threading
 
 try:
     sys.stdout.reconfigure(encoding="utf-8")
@@ -19,6 +21,17 @@ DOCUMENT_FILES = [
     SAMPLE_DIR / "1099_nec_3.pdf",      # 1099-NEC
 ]
 
+# requests.Session isn't thread-safe, so each thread reuses keep-alive connections
+# through its own session
+_local = threading.local()
+
+
+def get_session():
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = requests.Session()
+    return session
+
 
 def upload_documents():
     files = []
@@ -29,7 +42,7 @@ def upload_documents():
             open_files.append(fh)
             files.append(("files", (path.name, fh, "application/pdf")))
 
-        response = requests.post(f"{BASE_URL}/sessions", files=files)
+        response = get_session().post(f"{BASE_URL}/sessions", files=files)
         response.raise_for_status()
         data = response.json()
         print(f"Session created: {data['session_id']}")
@@ -40,11 +53,19 @@ def upload_documents():
             fh.close()
 
 
+def extract_document(doc_id):
+    return get_session().post(f"{BASE_URL}/documents/{doc_id}/extract")
+
+
 def extract_all(documents):
     for doc in documents:
-        doc_id = doc["id"]
-        print(f"Extracting {doc['filename']} ({doc_id}) ...")
-        response = requests.post(f"{BASE_URL}/documents/{doc_id}/extract")
+        print(f"Extracting {doc['filename']} ({doc['id']}) ...")
+
+    # Extractions are independent, so run them concurrently, one session per worker thread
+    with ThreadPoolExecutor(max_workers=max(len(documents), 1)) as executor:
+        responses = list(executor.map(extract_document, (doc["id"] for doc in documents)))
+
+    for response in responses:
         response.raise_for_status()
     print("Extraction complete for all documents.\n")
 
@@ -64,7 +85,7 @@ def process_session(session_id):
     }
 
     print("Running agent workflow...")
-    response = requests.post(
+    response = get_session().post(
         f"{BASE_URL}/sessions/{session_id}/process",
         json=payload
     )
@@ -92,15 +113,17 @@ def process_session(session_id):
 
 def generate_form_1040(session_id):
     print("\nGenerating Form 1040 PDF...")
-    response = requests.post(f"{BASE_URL}/reports/{session_id}/1040")
-    response.raise_for_status()
-
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     pdf_path = OUTPUT_DIR / f"Form_1040_{session_id}.pdf"
-    with open(pdf_path, "wb") as pdf_file:
-        pdf_file.write(response.content)
 
-    print(f"Form 1040 saved to {pdf_path}")
+    # Stream the body straight to disk rather than holding it in response.content
+    with get_session().post(f"{BASE_URL}/reports/{session_id}/1040", stream=True) as response:
+        response.raise_for_status()
+        with open(pdf_path, "wb") as pdf_file:
+            for chunk in response.iter_content(chunk_size=65536):
+                pdf_file.write(chunk)
+
+    print(f"Form 1040 saved to {pdf_path} ({pdf_path.stat().st_size} bytes)")
 
 
 def run_e2e_test():
@@ -118,7 +141,7 @@ def run_e2e_test():
 
     finally:
         # optional cleanup
-        requests.delete(f"{BASE_URL}/sessions/{session_id}")
+        get_session().delete(f"{BASE_URL}/sessions/{session_id}")
         print(f"\nSession {session_id} cleaned up.")
 
 
@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+# app.core.config builds Settings() at import time and these have no defaults;
+# the tests never call out to Azure or OpenAI
+os.environ.setdefault("DOCUMENTINTELLIGENCE_ENDPOINT", "https://example.cognitiveservices.azure.com/")
+os.environ.setdefault("DOCUMENTINTELLIGENCE_API_KEY", "test")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+
+@pytest.fixture
+def db():
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from app.db.session import Base
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        yield session
+    engine.dispose()
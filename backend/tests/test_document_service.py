@@ -0,0 +1,23 @@
+import asyncio
+
+from app.models.models import Document, ExtractionResult
+from app.schemas.schemas import ExtractionResultRead, W2Data
+from app.services.document_service import DocumentService
+
+
+def test_extract_document_matches_stored_row(monkeypatch, tmp_path, db):
+    async def fake_process_document(pdf_path):
+        return "W-2", W2Data(tax_year="2024", wages_tips_other_compensation=50000.0), []
+
+    monkeypatch.setattr("app.services.document_service.process_document", fake_process_document)
+    pdf_path = tmp_path / "w2.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4\n")
+    db.add(Document(id="doc-1", filename="w2.pdf", file_path=str(pdf_path), file_size=9))
+    db.commit()
+
+    result = asyncio.run(DocumentService.extract_document_data(db, "doc-1"))
+    db.expire_all()
+    stored = ExtractionResultRead.model_validate(db.get(ExtractionResult, result.id))
+
+    assert result.model_dump_json() == stored.model_dump_json()
+    assert db.get(Document, "doc-1").status == "parsed"
@@ -0,0 +1,71 @@
+from pypdf import PdfWriter
+
+from app.services.form_1040_service import Form1040Service
+
+
+def _write_template(path, width):
+    writer = PdfWriter()
+    writer.add_blank_page(width=width, height=792)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def _fill(monkeypatch, tmp_path, field_values):
+    monkeypatch.setattr(Form1040Service, "TEMPLATE_PATH", tmp_path / "f1040.pdf")
+    monkeypatch.setattr(Form1040Service, "OUTPUT_DIR", tmp_path / "reports")
+    # Simulate a fresh process so the template is read again
+    monkeypatch.setattr(Form1040Service, "_PROTOTYPE_BYTES", None)
+    monkeypatch.setattr(Form1040Service, "_PROTOTYPE_DIGEST", None)
+    monkeypatch.setattr(Form1040Service, "_FIELD_INDEX", None)
+    return Form1040Service._fill_pdf("session", field_values, "single")
+
+
+def test_fill_pdf_reuses_output_for_same_template_and_values(monkeypatch, tmp_path):
+    _write_template(tmp_path / "f1040.pdf", 612)
+    output_path = _fill(monkeypatch, tmp_path, {"f1_04[0]": "Jane"})
+    output_path.write_bytes(b"unchanged")
+    
+    assert _fill(monkeypatch, tmp_path, {"f1_04[0]": "Jane"}).read_bytes() == b"unchanged"
+    assert _fill(monkeypatch, tmp_path, {"f1_04[0]": "John"}).read_bytes() != b"unchanged"
+
+
+def test_fill_pdf_refills_when_template_changes(monkeypatch, tmp_path):
+    _write_template(tmp_path / "f1040.pdf", 612)
+    output_path = _fill(monkeypatch, tmp_path, {"f1_04[0]": "Jane"})
+    output_path.write_bytes(b"stale")
+    
+    _write_template(tmp_path / "f1040.pdf", 600)
+    assert _fill(monkeypatch, tmp_path, {"f1_04[0]": "Jane"}).read_bytes() != b"stale"
+
+
+def test_prepare_form_data_line_amounts():
+    calc_result = {
+        "gross_income": 1000,
+        "standard_deduction": 100,
+        "taxable_income": 900,
+        "tax_liability": 90,
+        "total_withholding": 120,
+        "status": "refund",
+        "refund_or_owed": 30,
+    }
+    aggregated_data = {"total_wages": 700, "total_interest": 200, "total_nec_income": 100}
+    
+    form_data = Form1040Service._prepare_form_data({}, calc_result, aggregated_data, "single")
+    
+    lines = {key: form_data.get(field) for key, field in Form1040Service.FIELD_MAPPING.items() if key.startswith("line_")}
+    assert lines == {
+        "line_1a": "700.00",
+        "line_1z": "700.00",
+        "line_2b": "200.00",
+        "line_8": "100.00",
+        "line_9": "1,000.00",
+        "line_11": "1,000.00",
+        "line_12": "100.00",
+        "line_15": "900.00",
+        "line_16": "90.00",
+        "line_24": "90.00",
+        "line_25a": "120.00",
+        "line_33": "120.00",
+        "line_34": "30.00",
+        "line_37": None,
+    }
@@ -0,0 +1,45 @@
+import pytest
+
+from app.services.form_1040_service import Form1040Service, _split_address
+
+
+@pytest.mark.parametrize(
+    "full_name, expected",
+    [
+        ("Jane Doe", ("Jane", "Doe")),
+        ("Jane Q Doe", ("Jane", "Q Doe")),
+        ("Jane", ("Jane", "")),
+        ("", ("", "")),
+    ],
+)
+def test_filer_name(full_name, expected):
+    form_data = Form1040Service._prepare_form_data({"filer_name": full_name}, {}, {}, "single")
+    fields = Form1040Service.FIELD_MAPPING["filer_first_name"], Form1040Service.FIELD_MAPPING["filer_last_name"]
+    assert tuple(form_data.get(field, "") for field in fields) == expected
+
+
+@pytest.mark.parametrize(
+    "address, expected",
+    [
+        ("123 Main St, Springfield, IL 62704", ("123 Main St", "Springfield", "IL", "62704")),
+        ("123 Main St, Springfield, IL 62704-1234", ("123 Main St", "Springfield", "IL", "62704-1234")),
+        ("123 Main St, Apt 4, Springfield, IL 62704", ("123 Main St, Apt 4", "Springfield", "IL", "62704")),
+        # Tails that aren't "ST 12345" fall back to the left-to-right split
+        ("123 Main St, Springfield, IL 62704, USA", ("123 Main St", "Springfield", "IL", "62704")),
+        ("123 Main St, Springfield, Illinois 62704", ("123 Main St", "Springfield", "Illinois", "62704")),
+        ("123 Main St, Springfield, IL, 62704", ("123 Main St", "Springfield", "IL", "")),
+        ("123 Main St, Springfield, IL 627", ("123 Main St", "Springfield", "IL", "627")),
+        ("123 Main St, Springfield", ("123 Main St", "Springfield", "", "")),
+        ("123 Main St", ("123 Main St", "", "", "")),
+        ("", ("", "", "", "")),
+    ],
+)
+def test_split_address(address, expected):
+    assert _split_address(address) == expected
+
+
+def test_split_address_long_input():
+    # Must stay linear in the input length; this is user-supplied
+    street = "a" * 100_000
+    assert _split_address(f"{street}, Springfield, IL 62704") == (street, "Springfield", "IL", "62704")
+    assert _split_address("," * 100_000) == ("", "", "", "")
@@ -0,0 +1,61 @@
+import io
+from tempfile import SpooledTemporaryFile
+
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from app.services.session_service import SessionService, _copy_upload
+
+DATA = b"%PDF-1.7\n" + bytes(range(256)) * 64
+
+
+def _spool(max_size):
+    spool = SpooledTemporaryFile(max_size=max_size)
+    spool.write(DATA)
+    spool.seek(0)
+    return spool
+
+
+@pytest.mark.parametrize("start", [0, 9])
+def test_copy_upload_in_memory_spool_stays_in_memory(tmp_path, start):
+    source = _spool(max_size=len(DATA) + 1)
+    source.seek(start)
+    with open(tmp_path / "out.pdf", "wb") as destination:
+        _copy_upload(source, destination)
+
+    assert isinstance(source._file, io.BytesIO)
+    assert (tmp_path / "out.pdf").read_bytes() == DATA[start:]
+
+
+@pytest.mark.parametrize("start", [0, 9])
+def test_copy_upload_rolled_spool(tmp_path, start):
+    source = _spool(max_size=16)
+    source.seek(start)
+    with open(tmp_path / "out.pdf", "wb") as destination:
+        destination.write(b"head")
+        _copy_upload(source, destination)
+
+    assert (tmp_path / "out.pdf").read_bytes() == b"head" + DATA[start:]
+    assert source.tell() == len(DATA)
+
+
+def test_copy_upload_plain_buffer(tmp_path):
+    with open(tmp_path / "out.pdf", "wb") as destination:
+        _copy_upload(io.BytesIO(DATA), destination)
+
+    assert (tmp_path / "out.pdf").read_bytes() == DATA
+
+
+def test_create_session_timestamps_match_get_session(monkeypatch, tmp_path, db):
+    monkeypatch.setattr("app.services.session_service.UPLOAD_DIR", str(tmp_path))
+    upload = UploadFile(
+        io.BytesIO(DATA),
+        filename="w2.pdf",
+        headers=Headers({"content-type": "application/pdf"}),
+    )
+
+    created = SessionService.create_session_with_files(db, [upload])
+    fetched = SessionService.get_session(db, created.session_id)
+
+    assert created.model_dump_json() == fetched.model_dump_json()
@@ -0,0 +1,18 @@
+import pytest
+
+from app.services.workflow_state_service import WorkflowStateService
+
+
+def test_save_state_upserts(db):
+    WorkflowStateService.save_state(db, "s-1", {"session_id": "s-1", "status": "extracting"})
+    saved = WorkflowStateService.save_state(db, "s-1", {"session_id": "s-1", "status": "validating"})
+
+    assert saved.status == "validating"
+    assert WorkflowStateService.get_state(db, "s-1") == {"session_id": "s-1", "status": "validating"}
+
+
+def test_save_state_unsupported_dialect(monkeypatch, db):
+    monkeypatch.setattr(db.get_bind().dialect, "name", "mssql")
+
+    with pytest.raises(NotImplementedError, match="'mssql'"):
+        WorkflowStateService.save_state(db, "s-1", {"session_id": "s-1", "status": "extracting"})